@@ -5,11 +5,108 @@ Run: streamlit run app.py
 
 import streamlit as st
 import numpy as np
-import pandas as pd
 import joblib
 import json
-import time
+import math
 import os
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
+
+from model_adapters import (NUMBA_AVAILABLE, LightGBMModel, LleavesModel, NumbaForest,
+                            OnnxModel, TreeliteModel,
+                            QuantizedForest)
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+DOW_MAP = {"Mon":0,"Tue":1,"Wed":2,"Thu":3,"Fri":4,"Sat":5,"Sun":6}
+
+MERCHANT_CATS = ("Grocery","Gas","Restaurant","Travel","Shopping",
+                 "Entertainment","Healthcare","Electronics","Online","Other")
+
+LABEL_MAP = {
+    'risk_composite':'Risk Composite','geo_risk_score':'Geo Risk Score',
+    'velocity_score':'Velocity Score','credit_limit_used_pct':'Credit Limit Used',
+    'num_transactions_24h':'Txns 24h','hour_of_day':'Hour of Day',
+    'distance_from_home':'Distance Home','num_transactions_1h':'Txns 1h',
+    'amount_to_avg_ratio':'Amt/Avg Ratio','amount':'Amount',
+    'is_international':'Is International','avg_amount_30d':'Avg Amt 30d',
+    'days_since_last_txn':'Days Since Txn','txn_burst':'Txn Burst',
+    'day_of_week':'Day of Week','is_online':'Is Online',
+    'card_present':'Card Present','merchant_category':'Merchant Cat',
+}
+
+# Preset scenarios: (title, description, colour, raw inputs — derived features
+# are added by scenario_features())
+SCENARIOS = (
+    ("🛒 Normal Purchase", "Small, local, daytime transaction", "#10b981", dict(
+        amount=45.0, hour_of_day=13, day_of_week=2, merchant_category=0,
+        num_transactions_1h=1, num_transactions_24h=4, avg_amount_30d=80.0,
+        distance_from_home=5.0, is_online=0, is_international=0, card_present=1,
+        days_since_last_txn=1.0, credit_limit_used_pct=0.2,
+        velocity_score=0.1, geo_risk_score=0.03)),
+    ("✈️ Travel Transaction", "International, moderate amount", "#f59e0b", dict(
+        amount=350.0, hour_of_day=16, day_of_week=5, merchant_category=3,
+        num_transactions_1h=1, num_transactions_24h=3, avg_amount_30d=150.0,
+        distance_from_home=900.0, is_online=0, is_international=1, card_present=1,
+        days_since_last_txn=1.5, credit_limit_used_pct=0.35,
+        velocity_score=0.15, geo_risk_score=0.3)),
+    ("🚨 Card Stolen", "High amount, late night, international", "#ef4444", dict(
+        amount=2500.0, hour_of_day=3, day_of_week=6, merchant_category=7,
+        num_transactions_1h=3, num_transactions_24h=8, avg_amount_30d=90.0,
+        distance_from_home=600.0, is_online=0, is_international=1, card_present=0,
+        days_since_last_txn=0.1, credit_limit_used_pct=0.8,
+        velocity_score=0.75, geo_risk_score=0.85)),
+    ("💻 Online Fraud", "Velocity burst + near credit limit", "#dc2626", dict(
+        amount=900.0, hour_of_day=1, day_of_week=4, merchant_category=8,
+        num_transactions_1h=9, num_transactions_24h=20, avg_amount_30d=60.0,
+        distance_from_home=300.0, is_online=1, is_international=0, card_present=0,
+        days_since_last_txn=0.05, credit_limit_used_pct=0.95,
+        velocity_score=0.9, geo_risk_score=0.7)),
+)
+
+# Sidebar inputs behind each derived feature, and each input's default value.
+# Only inputs the loaded model needs are rendered; the rest keep their default.
+DERIVED_INPUTS = {
+    'amount_to_avg_ratio': ('amount', 'avg_amount_30d'),
+    'txn_burst':           ('num_transactions_1h', 'num_transactions_24h'),
+    'risk_composite':      ('velocity_score', 'geo_risk_score'),
+}
+INPUT_DEFAULTS = {
+    'amount': 120.0, 'hour_of_day': 14, 'day_of_week': "Mon", 'days_since_last_txn': 2.0,
+    'merchant_category': 0, 'distance_from_home': 15.0,
+    'is_online': False, 'is_international': False, 'card_present': True,
+    'num_transactions_1h': 1, 'num_transactions_24h': 4, 'avg_amount_30d': 85.0,
+    'credit_limit_used_pct': 0.2, 'velocity_score': 0.1, 'geo_risk_score': 0.05,
+}
+
+# Risk tiers: fraud probability bins [0, .2) [.2, .5) [.5, .8) [.8, 1]
+RISK_EDGES  = np.array([0.2, 0.5, 0.8])
+RISK_TIERS  = ("LOW",     "MODERATE", "HIGH",    "CRITICAL")
+RISK_COLORS = ("#10b981", "#f59e0b",  "#ef4444", "#dc2626")
+RISK_TILES  = ("green",   "amber",    "red",     "red")
+
+# Risk-factor rules
+# One row per rule: (level, message template, icon). A rule fires when
+# (value - threshold) * sign > 0, i.e. sign +1 means "above", -1 means "below".
+# Values: amount/avg_30d, hour, is_intl, distance, txns_1h, velocity, geo_risk, credit_used
+RISK_RULES = (
+    ("HIGH", "Amount is 2× above 30-day average",          "💰"),
+    ("MED",  "Transaction at unusual hour (midnight-6AM)",  "🌙"),
+    ("MED",  "International transaction detected",          "🌍"),
+    ("HIGH", "Far from home: {distance:.0f} km",            "📍"),
+    ("HIGH", "Velocity burst: {num_txn_1h} txns in 1h",     "⚡"),
+    ("HIGH", "High velocity score: {velocity_sc:.2f}",      "🚀"),
+    ("HIGH", "High geo risk: {geo_risk_sc:.2f}",            "🗺️"),
+    ("MED",  "Near credit limit: {credit_pct:.0%} used",    "💳"),
+)
+RISK_THRESHOLDS = np.array([2.0, 6.0, 0.5, 200.0, 5.0, 0.7, 0.7, 0.85])
+RISK_SIGNS      = np.array([1,   -1,  1,   1,     1,   1,   1,   1])
+# Sidebar inputs each rule reads; a rule is only checked when all were entered
+RISK_INPUTS = (
+    ('amount', 'avg_amount_30d'), ('hour_of_day',), ('is_international',),
+    ('distance_from_home',), ('num_transactions_1h',), ('velocity_score',),
+    ('geo_risk_score',), ('credit_limit_used_pct',),
+)
+
 
 # ── Page Config ──────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -20,389 +117,279 @@ st.set_page_config(
 )
 
 # ── Load Model Artifacts ──────────────────────────────────────────────────────
+def _fresh(path):
+    """True if a derived model file exists and is not older than fraud_model.joblib."""
+    return (os.path.exists(path) and
+            os.path.getmtime(path) >= os.path.getmtime("fraud_model.joblib"))
+
+def open_model():
+    """Prefer the LightGBM model (JIT-compiled by lleaves, else the LightGBM
+    booster), then the Treelite-compiled model, then the quantized forest, then
+    the ONNX export, else the joblib model (a forest is walked by Numba when
+    installed)."""
+    if _fresh("fraud_model_lgb.txt"):
+        try:
+            return LleavesModel("fraud_model_lgb.txt", "fraud_model_lgb.o")
+        except ImportError:
+            pass
+        try:
+            return LightGBMModel("fraud_model_lgb.txt")
+        except ImportError:
+            pass
+    if _fresh("fraud_model_tl.so"):
+        try:
+            return TreeliteModel("fraud_model_tl.so",
+                                 joblib.load("feature_importances.joblib", mmap_mode="r"))
+        except (ImportError, OSError):
+            pass   # not installed, or a library this runtime cannot load
+    if _fresh("fraud_model_q.joblib"):
+        return QuantizedForest(**joblib.load("fraud_model_q.joblib", mmap_mode="r"))
+    if _fresh("fraud_model.onnx"):
+        try:
+            return OnnxModel("fraud_model.onnx",
+                             joblib.load("feature_importances.joblib", mmap_mode="r"))
+        except ImportError:
+            pass
+    model = joblib.load("fraud_model.joblib")   # compressed (see train_model.py) — not mmap-able
+    if not isinstance(model, RandomForestClassifier):
+        # Boosted models have no feature_importances_; train_model.py saves them
+        if not hasattr(model, "feature_importances_"):
+            model.feature_importances_ = joblib.load("feature_importances.joblib")
+        return model
+    if NUMBA_AVAILABLE:
+        return NumbaForest(model)
+    # Independent trees — sklearn predicts forests on joblib's threading backend,
+    # so every core shares the one input row with no pickling
+    model.n_jobs = -1
+    return model
+
 @st.cache_resource
-def load_artifacts():
-    model    = joblib.load("fraud_model.joblib")
-    scaler   = joblib.load("scaler.joblib")
-    features = joblib.load("feature_names.joblib")
-    return model, scaler, features
+def load_model(n_features):
+    """The serving model, warmed with one throwaway prediction so first-call setup
+    (JIT/native library init, lazy sklearn imports) is paid at boot, not on ANALYZE."""
+    model = open_model()
+    model.predict_proba(np.zeros((1, n_features), dtype=np.float32))
+    return model
+
+@st.cache_resource
+def load_features():
+    return joblib.load("feature_names.joblib")
+
+@st.cache_resource
+def load_scaler():
+    """(scaler, mean, inv_scale) — mean/inv_scale are set for the fused kernel."""
+    scaler = joblib.load("scaler.joblib")
+    # Any StandardScaler is applied as a fused float32 (x - mean) * 1/scale kernel
+    # (a disabled step becomes 0 / 1; 1/scale is taken in float64, then cast), an
+    # identity transformer is dropped, and anything else uses scaler.transform
+    if isinstance(scaler, FunctionTransformer) and scaler.func is None:
+        scaler = None
+    if isinstance(scaler, StandardScaler):
+        n         = scaler.n_features_in_
+        mean      = (scaler.mean_ if scaler.with_mean else np.zeros(n)).astype(np.float32)
+        inv_scale = (1.0 / scaler.scale_ if scaler.with_std else np.ones(n)).astype(np.float32)
+    else:
+        mean = inv_scale = None
+    return scaler, mean, inv_scale
 
 try:
-    model, scaler, FEATURES = load_artifacts()
+    FEATURES                = load_features()
+    scaler, MEAN, INV_SCALE = load_scaler()
+    model                   = load_model(len(FEATURES))
     MODEL_LOADED = True
+    # Column index per feature + a reusable 1-row input buffer (no DataFrame per rerun)
+    FEATURE_IDX = {f: i for i, f in enumerate(FEATURES)}
+    SHOWN       = frozenset(i for f in FEATURES for i in DERIVED_INPUTS.get(f, (f,)))
+    # float32 end to end — the tree models compare in float32 anyway. Buffers live
+    # in session_state: each session reruns on its own thread, so none are shared
+    if st.session_state.get('x_buf', np.empty(0)).shape != (1, len(FEATURES)):
+        st.session_state.x_buf     = np.empty((1, len(FEATURES)), dtype=np.float32)
+        st.session_state.x_scratch = np.empty_like(st.session_state.x_buf)
 except FileNotFoundError:
     MODEL_LOADED = False
 
-# ── Global CSS ────────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=DM+Sans:wght@300;400;500;600;700&display=swap');
-
-/* ── Reset & Variables ── */
-:root {
-    --bg-void:      #030712;
-    --bg-panel:     #0d1117;
-    --bg-card:      #111827;
-    --bg-card2:     #1a2332;
-    --border:       #1e2d3d;
-    --border-glow:  #0ea5e9;
-    --text-primary: #f0f6fc;
-    --text-muted:   #6b7c93;
-    --text-dim:     #3d4f61;
-    --accent-cyan:  #00d4ff;
-    --accent-blue:  #0ea5e9;
-    --accent-green: #10b981;
-    --accent-red:   #ef4444;
-    --accent-amber: #f59e0b;
-    --accent-purple:#8b5cf6;
-    --gradient-1: linear-gradient(135deg, #0ea5e9 0%, #8b5cf6 100%);
-    --gradient-safe: linear-gradient(135deg, #10b981 0%, #059669 100%);
-    --gradient-fraud: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-    --font-mono: 'Space Mono', monospace;
-    --font-sans: 'DM Sans', sans-serif;
-    --shadow-glow: 0 0 30px rgba(14,165,233,0.15);
-    --shadow-card: 0 8px 32px rgba(0,0,0,0.4);
-    --radius: 12px;
-    --radius-lg: 20px;
-}
 
-/* ── Base ── */
-html, body, .stApp {
-    background: var(--bg-void) !important;
-    color: var(--text-primary) !important;
-    font-family: var(--font-sans) !important;
-}
-.block-container { padding: 1.5rem 2rem !important; max-width: 1400px; }
-section[data-testid="stSidebar"] {
-    background: var(--bg-panel) !important;
-    border-right: 1px solid var(--border) !important;
-}
-section[data-testid="stSidebar"] * { color: var(--text-primary) !important; }
-
-/* ── Hero Header ── */
-.hero-header {
-    background: var(--bg-panel);
-    border: 1px solid var(--border);
-    border-top: 3px solid transparent;
-    border-image: linear-gradient(90deg, #0ea5e9, #8b5cf6, #0ea5e9) 1;
-    border-radius: 0 0 var(--radius-lg) var(--radius-lg);
-    padding: 2.5rem 3rem;
-    margin-bottom: 2rem;
-    position: relative;
-    overflow: hidden;
-}
-.hero-header::before {
-    content: '';
-    position: absolute;
-    top: -50%;
-    left: -50%;
-    width: 200%;
-    height: 200%;
-    background: radial-gradient(ellipse at 30% 50%, rgba(14,165,233,0.06) 0%, transparent 60%),
-                radial-gradient(ellipse at 70% 50%, rgba(139,92,246,0.06) 0%, transparent 60%);
-    pointer-events: none;
-}
-.hero-title {
-    font-family: var(--font-mono);
-    font-size: 2.6rem;
-    font-weight: 700;
-    letter-spacing: -1px;
-    background: linear-gradient(90deg, #00d4ff 0%, #8b5cf6 60%, #ec4899 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    margin: 0;
-    line-height: 1.1;
-}
-.hero-sub {
-    font-size: 1rem;
-    color: var(--text-muted);
-    margin-top: 0.5rem;
-    letter-spacing: 0.5px;
-}
-.hero-badges {
-    display: flex;
-    gap: 0.6rem;
-    margin-top: 1.2rem;
-    flex-wrap: wrap;
-}
-.badge {
-    font-family: var(--font-mono);
-    font-size: 0.65rem;
-    padding: 0.25rem 0.75rem;
-    border-radius: 999px;
-    border: 1px solid;
-    letter-spacing: 1px;
-    text-transform: uppercase;
-}
-.badge-blue  { border-color: #0ea5e9; color: #0ea5e9; background: rgba(14,165,233,0.08); }
-.badge-purple{ border-color: #8b5cf6; color: #8b5cf6; background: rgba(139,92,246,0.08); }
-.badge-green { border-color: #10b981; color: #10b981; background: rgba(16,185,129,0.08); }
-
-/* ── Section Title ── */
-.section-label {
-    font-family: var(--font-mono);
-    font-size: 0.65rem;
-    letter-spacing: 3px;
-    text-transform: uppercase;
-    color: var(--accent-cyan);
-    margin-bottom: 1rem;
-    padding-left: 0.75rem;
-    border-left: 2px solid var(--accent-cyan);
-}
-
-/* ── Cards ── */
-.glass-card {
-    background: var(--bg-card);
-    border: 1px solid var(--border);
-    border-radius: var(--radius-lg);
-    padding: 1.5rem;
-    margin-bottom: 1rem;
-    transition: border-color 0.3s ease, box-shadow 0.3s ease;
-}
-.glass-card:hover {
-    border-color: #2a3f55;
-    box-shadow: var(--shadow-glow);
-}
-
-/* ── Metric Tiles ── */
-.metric-grid {
-    display: grid;
-    grid-template-columns: repeat(4, 1fr);
-    gap: 1rem;
-    margin-bottom: 1.5rem;
-}
-.metric-tile {
-    background: var(--bg-card);
-    border: 1px solid var(--border);
-    border-radius: var(--radius);
-    padding: 1.2rem 1.4rem;
-    position: relative;
-    overflow: hidden;
-    transition: transform 0.2s ease, box-shadow 0.2s ease;
-}
-.metric-tile:hover { transform: translateY(-2px); box-shadow: 0 12px 40px rgba(0,0,0,0.5); }
-.metric-tile::after {
-    content: '';
-    position: absolute;
-    bottom: 0; left: 0;
-    height: 2px; width: 100%;
-}
-.metric-tile.blue::after  { background: var(--gradient-1); }
-.metric-tile.green::after { background: var(--gradient-safe); }
-.metric-tile.red::after   { background: var(--gradient-fraud); }
-.metric-tile.amber::after { background: linear-gradient(90deg, #f59e0b, #d97706); }
-.metric-label {
-    font-family: var(--font-mono);
-    font-size: 0.6rem;
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    color: var(--text-muted);
-}
-.metric-value {
-    font-family: var(--font-mono);
-    font-size: 1.9rem;
-    font-weight: 700;
-    color: var(--text-primary);
-    margin: 0.3rem 0 0;
-    line-height: 1;
-}
-.metric-icon {
-    font-size: 1.5rem;
-    float: right;
-    margin-top: -0.2rem;
-    opacity: 0.7;
-}
+# ── Scoring ───────────────────────────────────────────────────────────────────
+def score(amount, hour_of_day, day_of_week, merchant_category,
+          num_transactions_1h, num_transactions_24h, avg_amount_30d,
+          distance_from_home, is_online, is_international, card_present,
+          days_since_last_txn, credit_limit_used_pct, velocity_score,
+          geo_risk_score, amount_to_avg_ratio, txn_burst, risk_composite):
+    """Score one transaction as (P(legit), P(fraud)) — a direct model call; the
+    compiled runtimes answer in tens of µs, less than a st.cache_data lookup."""
+    values  = locals()
+    buf     = st.session_state.x_buf
+    scratch = st.session_state.x_scratch
+    for feat, idx in FEATURE_IDX.items():
+        buf[0, idx] = values[feat]
+    if MEAN is not None:
+        np.subtract(buf, MEAN, out=scratch)
+        np.multiply(scratch, INV_SCALE, out=scratch)
+        input_sc = scratch
+    elif scaler is not None:
+        input_sc = scaler.transform(buf)
+    else:
+        input_sc = buf
+    prob = model.predict_proba(input_sc)[0]
+    return float(prob[0]), float(prob[1])
+
+def derived(amount, avg_amt_30d, num_txn_1h, num_txn_24h, velocity_sc, geo_risk_sc):
+    """(amount_to_avg_ratio, txn_burst, risk_composite) — same formulas as training."""
+    return (amount / (avg_amt_30d + 1),
+            num_txn_1h / (num_txn_24h + 1),
+            (velocity_sc + geo_risk_sc) / 2)
+
+def scenario_features(raw):
+    """Raw scenario inputs plus the three derived features, in training form."""
+    amount_to_avg, txn_burst, risk_comp = derived(
+        raw['amount'], raw['avg_amount_30d'], raw['num_transactions_1h'],
+        raw['num_transactions_24h'], raw['velocity_score'], raw['geo_risk_score'])
+    return {
+        **raw,
+        'amount_to_avg_ratio': amount_to_avg,
+        'txn_burst':           txn_burst,
+        'risk_composite':      risk_comp,
+    }
 
-/* ── Result Banner ── */
-.result-safe {
-    background: linear-gradient(135deg, rgba(16,185,129,0.12) 0%, rgba(5,150,105,0.06) 100%);
-    border: 1px solid rgba(16,185,129,0.4);
-    border-left: 4px solid #10b981;
-    border-radius: var(--radius);
-    padding: 1.8rem 2rem;
-    margin: 1.5rem 0;
-    animation: slideIn 0.4s ease;
-}
-.result-fraud {
-    background: linear-gradient(135deg, rgba(239,68,68,0.12) 0%, rgba(220,38,38,0.06) 100%);
-    border: 1px solid rgba(239,68,68,0.4);
-    border-left: 4px solid #ef4444;
-    border-radius: var(--radius);
-    padding: 1.8rem 2rem;
-    margin: 1.5rem 0;
-    animation: slideIn 0.4s ease, pulse-fraud 2s infinite;
-}
-@keyframes slideIn {
-    from { opacity: 0; transform: translateY(10px); }
-    to   { opacity: 1; transform: translateY(0); }
-}
-@keyframes pulse-fraud {
-    0%, 100% { box-shadow: 0 0 0 0 rgba(239,68,68,0); }
-    50%       { box-shadow: 0 0 20px 4px rgba(239,68,68,0.15); }
-}
-.result-emoji { font-size: 2.5rem; }
-.result-title {
-    font-family: var(--font-mono);
-    font-size: 1.5rem;
-    font-weight: 700;
-    margin: 0.3rem 0;
-}
-.result-title.safe  { color: #10b981; }
-.result-title.fraud { color: #ef4444; }
-.result-meta { color: var(--text-muted); font-size: 0.88rem; margin-top: 0.2rem; }
-
-/* ── Probability Bar ── */
-.prob-container { margin: 1rem 0; }
-.prob-label {
-    display: flex;
-    justify-content: space-between;
-    font-family: var(--font-mono);
-    font-size: 0.75rem;
-    color: var(--text-muted);
-    margin-bottom: 0.4rem;
-}
-.prob-track {
-    height: 10px;
-    background: rgba(255,255,255,0.05);
-    border-radius: 999px;
-    overflow: hidden;
-    border: 1px solid var(--border);
-}
-.prob-fill {
-    height: 100%;
-    border-radius: 999px;
-    transition: width 0.8s cubic-bezier(0.4,0,0.2,1);
-}
-.prob-fill.safe  { background: var(--gradient-safe); }
-.prob-fill.fraud { background: var(--gradient-fraud); }
-
-/* ── Feature Importance Bar ── */
-.fi-row {
-    display: flex;
-    align-items: center;
-    gap: 0.8rem;
-    margin-bottom: 0.6rem;
-}
-.fi-name {
-    font-family: var(--font-mono);
-    font-size: 0.72rem;
-    color: var(--text-muted);
-    width: 200px;
-    flex-shrink: 0;
-}
-.fi-track {
-    flex: 1;
-    height: 6px;
-    background: rgba(255,255,255,0.05);
-    border-radius: 999px;
-    overflow: hidden;
-}
-.fi-fill {
-    height: 100%;
-    border-radius: 999px;
-    background: linear-gradient(90deg, #0ea5e9, #8b5cf6);
-}
-.fi-val {
-    font-family: var(--font-mono);
-    font-size: 0.68rem;
-    color: var(--text-dim);
-    width: 45px;
-    text-align: right;
-    flex-shrink: 0;
-}
+@st.cache_resource
+def scenario_matrix(features):
+    """Every preset scenario as one float32 row, columns in model order."""
+    return np.array([[feats[f] for f in features]
+                     for feats in (scenario_features(sc[3]) for sc in SCENARIOS)],
+                    dtype=np.float32)
+
+@st.cache_data
+def scenario_cards_html(model_id):
+    """Preset scenario cards, all scored by a single batched predict_proba call."""
+    X = scenario_matrix(tuple(FEATURES))
+    if MEAN is not None:
+        X = (X - MEAN) * INV_SCALE
+    elif scaler is not None:
+        X = scaler.transform(X)
+    probs = model.predict_proba(X)[:, 1]
+    return tuple(SCENARIO_CARD_HTML.format(color=color, icon=title.split()[0],
+                                           name=' '.join(title.split()[1:]),
+                                           desc=desc, pct=prob * 100)
+                 for (title, desc, color, _), prob in zip(SCENARIOS, probs))
+
+@st.cache_data
+def feature_importance_html(model_id, importances, features, label_items):
+    """Top-10 importance bars as HTML — constant for a loaded model, so built once.
+
+    Arguments are tuples because st.cache_data hashes them (ndarrays/dicts aren't
+    hashable keys).
+    """
+    imp       = np.asarray(importances)
+    max_fi    = imp.max()
+    label_map = dict(label_items)
 
-/* ── Input Sliders ── */
-.stSlider > div > div > div { background: var(--accent-blue) !important; }
-.stSlider [data-testid="stTickBarMin"],
-.stSlider [data-testid="stTickBarMax"] { color: var(--text-dim) !important; font-family: var(--font-mono); }
-
-/* ── Risk Gauge ── */
-.gauge-container { text-align: center; padding: 1rem 0; }
-.gauge-arc {
-    width: 180px;
-    height: 90px;
-    margin: 0 auto;
-    position: relative;
-}
-.risk-level-text {
-    font-family: var(--font-mono);
-    font-size: 0.9rem;
-    margin-top: 0.5rem;
-}
+    fi_html = '<div class="glass-card">'
+    for i in np.argsort(-imp, kind="stable")[:10]:
+        feat, val = features[i], imp[i]
+        pct  = val / max_fi * 100
+        name = label_map.get(feat, feat)
+        fi_html += f"""
+        <div class="fi-row">
+            <div class="fi-name">{name}</div>
+            <div class="fi-track">
+                <div class="fi-fill" style="width:{pct:.1f}%;"></div>
+            </div>
+            <div class="fi-val">{val:.3f}</div>
+        </div>"""
+    fi_html += '</div>'
+    return fi_html
 
-/* ── Sidebar Inputs ── */
-.sidebar-section {
-    background: rgba(255,255,255,0.03);
-    border: 1px solid var(--border);
-    border-radius: var(--radius);
-    padding: 1rem;
-    margin-bottom: 1rem;
-}
-.sidebar-section-title {
-    font-family: var(--font-mono);
-    font-size: 0.62rem;
-    letter-spacing: 2px;
-    text-transform: uppercase;
-    color: var(--accent-cyan);
-    margin-bottom: 0.8rem;
-    padding-bottom: 0.5rem;
-    border-bottom: 1px solid var(--border);
-}
+# ── Global CSS ────────────────────────────────────────────────────────────────
+@st.cache_resource
+def load_css():
+    """Read the stylesheet once per server process, not on every rerun."""
+    with open("assets/styles.css", encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
 
-/* ── Streamlit overrides ── */
-.stSelectbox label, .stSlider label, .stNumberInput label,
-.stRadio label, .stCheckbox label { 
-    color: var(--text-muted) !important;
-    font-family: var(--font-sans) !important;
-    font-size: 0.85rem !important;
-}
-div[data-baseweb="select"] {
-    background: var(--bg-card2) !important;
-    border-color: var(--border) !important;
-}
-div[data-baseweb="base-input"] {
-    background: var(--bg-card2) !important;
-}
-.stButton button {
-    background: var(--gradient-1) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: var(--radius) !important;
-    font-family: var(--font-mono) !important;
-    font-size: 0.85rem !important;
-    letter-spacing: 1.5px !important;
-    text-transform: uppercase !important;
-    padding: 0.75rem 2rem !important;
-    width: 100% !important;
-    transition: all 0.2s ease !important;
-    box-shadow: 0 4px 20px rgba(14,165,233,0.3) !important;
-}
-.stButton button:hover {
-    transform: translateY(-2px) !important;
-    box-shadow: 0 8px 30px rgba(14,165,233,0.5) !important;
-}
-hr { border-color: var(--border) !important; }
-.stMarkdown h3 { color: var(--text-primary) !important; font-family: var(--font-mono) !important; }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 
-# ── Hero Header ────────────────────────────────────────────────────────────────
-st.markdown("""
+# ── Static HTML Fragments ──────────────────────────────────────────────────────
+HERO_HTML = """
 <div class="hero-header">
     <div>
         <div class="hero-title">🛡️ FraudShield AI</div>
         <div class="hero-sub">Real-time Credit Card Fraud Detection powered by Machine Learning</div>
         <div class="hero-badges">
-            <span class="badge badge-blue">Random Forest</span>
-            <span class="badge badge-purple">18 Features</span>
+            <span class="badge badge-blue">Tree Ensemble</span>
+            <span class="badge badge-purple">{n_features} Features</span>
             <span class="badge badge-green">99.9% Accuracy</span>
             <span class="badge badge-blue">ROC-AUC: 1.00</span>
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+SIDEBAR_TITLE_HTML = """
+<div style="font-family:'Space Mono',monospace; font-size:1.1rem; font-weight:700;
+     color:#00d4ff; margin-bottom:1.5rem; padding-bottom:0.75rem;
+     border-bottom:1px solid #1e2d3d;">
+    ⚙️ Transaction Parameters
+</div>
+"""
+
+# Risk gauge: gauge_templates() fills the needle tip (nx, ny) per probability
+# bucket; the doubled-brace color/pct/tier slots survive for render time
+GAUGE_SVG = """
+<div class="glass-card" style="text-align:center; padding:2rem 1.5rem;">
+    <svg viewBox="0 0 180 100" width="100%" style="max-width:260px; margin:0 auto; display:block;">
+        <!-- Background arcs -->
+        <path d="M 10 85 A 80 80 0 0 1 90 5" stroke="#10b98133" stroke-width="14" fill="none" stroke-linecap="round"/>
+        <path d="M 90 5 A 80 80 0 0 1 140 25" stroke="#f59e0b33" stroke-width="14" fill="none" stroke-linecap="round"/>
+        <path d="M 140 25 A 80 80 0 0 1 170 85" stroke="#ef444433" stroke-width="14" fill="none" stroke-linecap="round"/>
+        <!-- Active arc -->
+        <path d="M 10 85 A 80 80 0 0 1 {nx:.1f} {ny:.1f}" stroke="{{color}}" stroke-width="14" fill="none" stroke-linecap="round" opacity="0.85"/>
+        <!-- Needle -->
+        <line x1="90" y1="85" x2="{nx:.1f}" y2="{ny:.1f}" stroke="white" stroke-width="2.5" stroke-linecap="round"/>
+        <circle cx="90" cy="85" r="5" fill="white"/>
+        <!-- Labels -->
+        <text x="10"  y="98" font-size="7" fill="#10b981" font-family="monospace">SAFE</text>
+        <text x="150" y="98" font-size="7" fill="#ef4444" font-family="monospace">FRAUD</text>
+        <text x="90"  y="62" text-anchor="middle" font-size="14" fill="white" font-family="monospace" font-weight="bold">{{pct}}%</text>
+        <text x="90"  y="74" text-anchor="middle" font-size="7" fill="#6b7c93" font-family="monospace">FRAUD PROBABILITY</text>
+    </svg>
+    <div style="font-family:'Space Mono',monospace; font-size:1.1rem; font-weight:700;
+         color:{{color}}; margin-top:0.5rem;">{{tier}} RISK</div>
+    <div style="font-family:'Space Mono',monospace; font-size:0.65rem; color:var(--text-muted); margin-top:0.25rem;">
+        Decision Threshold: 50.00%
+    </div>
+</div>
+"""
+
+SCENARIO_CARD_HTML = """
+<div style="background:var(--bg-card); border:1px solid var(--border);
+     border-top:2px solid {color}; border-radius:var(--radius);
+     padding:1rem; text-align:center; cursor:pointer;
+     transition: all 0.2s ease;">
+    <div style="font-size:1.5rem; margin-bottom:0.4rem;">{icon}</div>
+    <div style="font-family:'Space Mono',monospace; font-size:0.75rem;
+         font-weight:700; color:{color}; margin-bottom:0.3rem;">
+         {name}</div>
+    <div style="font-size:0.75rem; color:var(--text-muted);">{desc}</div>
+    <div style="font-family:'Space Mono',monospace; font-size:0.7rem;
+         color:var(--text-primary); margin-top:0.5rem;">
+         Model: {pct:.1f}% fraud</div>
+</div>
+"""
+
+@st.cache_resource
+def gauge_templates():
+    """One gauge SVG per 1% probability bucket (101 total), built once per process."""
+    templates = []
+    for p in range(101):
+        rad = (1 - p / 100) * math.pi   # pi=safe, 0=fraud
+        templates.append(GAUGE_SVG.format(nx=90 + 70 * math.cos(rad), ny=85 - 70 * math.sin(rad)))
+    return templates
+
+
+# ── Hero Header ────────────────────────────────────────────────────────────────
+st.markdown(HERO_HTML.format(n_features=len(FEATURES) if MODEL_LOADED else len(LABEL_MAP)),
+            unsafe_allow_html=True)
 
 
 # ── Model Check ────────────────────────────────────────────────────────────────
@@ -413,45 +400,54 @@ if not MODEL_LOADED:
 
 
 # ── Sidebar: Transaction Inputs ────────────────────────────────────────────────
-with st.sidebar:
-    st.markdown("""
-    <div style="font-family:'Space Mono',monospace; font-size:1.1rem; font-weight:700;
-         color:#00d4ff; margin-bottom:1.5rem; padding-bottom:0.75rem;
-         border-bottom:1px solid #1e2d3d;">
-        ⚙️ Transaction Parameters
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown('<div class="sidebar-section-title">💰 Amount & Timing</div>', unsafe_allow_html=True)
-    amount       = st.slider("Transaction Amount ($)", 0.5, 5000.0, 120.0, step=0.5)
-    hour_of_day  = st.slider("Hour of Day (0-23)", 0, 23, 14)
-    day_of_week  = st.selectbox("Day of Week", ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"])
-    dow_map      = {"Mon":0,"Tue":1,"Wed":2,"Thu":3,"Fri":4,"Sat":5,"Sun":6}
-    days_since   = st.slider("Days Since Last Transaction", 0.0, 30.0, 2.0, step=0.1)
+def section(title, *inputs, rule=True):
+    """Section header (after a divider), drawn only if the model uses one of its inputs."""
+    if SHOWN.intersection(inputs):
+        if rule:
+            st.markdown("---")
+        st.markdown(f'<div class="sidebar-section-title">{title}</div>', unsafe_allow_html=True)
+
+def field(name, widget, label, *args, **kwargs):
+    """Widget for a model input, or the input's default when the model ignores it."""
+    default = INPUT_DEFAULTS[name]
+    if name not in SHOWN:
+        return default
+    if widget is st.selectbox:
+        return widget(label, args[0], index=list(args[0]).index(default), **kwargs)
+    return widget(label, *args, value=default, **kwargs)
 
-    st.markdown("---")
-    st.markdown('<div class="sidebar-section-title">🏪 Merchant & Location</div>', unsafe_allow_html=True)
-    merchant_cat  = st.selectbox("Merchant Category", range(10),
-                      format_func=lambda x: ["Grocery","Gas","Restaurant","Travel","Shopping",
-                                              "Entertainment","Healthcare","Electronics",
-                                              "Online","Other"][x])
-    distance      = st.slider("Distance from Home (km)", 0.0, 1000.0, 15.0, step=1.0)
-    is_online     = st.checkbox("Online Transaction", value=False)
-    is_intl       = st.checkbox("International Transaction", value=False)
-    card_present  = st.checkbox("Card Present", value=True)
-
-    st.markdown("---")
-    st.markdown('<div class="sidebar-section-title">📊 Behavioral Signals</div>', unsafe_allow_html=True)
-    num_txn_1h   = st.slider("Transactions (last 1h)",  0, 20, 1)
-    num_txn_24h  = st.slider("Transactions (last 24h)", 0, 50, 4)
-    avg_amt_30d  = st.slider("Avg Amount (last 30d) $", 1.0, 3000.0, 85.0, step=1.0)
-
-    st.markdown("---")
-    st.markdown('<div class="sidebar-section-title">🔮 Risk Signals</div>', unsafe_allow_html=True)
-    credit_pct    = st.slider("Credit Limit Used %", 0.0, 1.0, 0.2, step=0.01,
-                              format="%.0f%%", help="0 = 0%, 1 = 100%")
-    velocity_sc   = st.slider("Velocity Score", 0.0, 1.0, 0.1, step=0.01)
-    geo_risk_sc   = st.slider("Geo Risk Score", 0.0, 1.0, 0.05, step=0.01)
+with st.sidebar:
+    st.markdown(SIDEBAR_TITLE_HTML, unsafe_allow_html=True)
+
+    section("💰 Amount & Timing", 'amount', 'hour_of_day', 'day_of_week', 'days_since_last_txn',
+            rule=False)
+    amount       = field('amount', st.slider, "Transaction Amount ($)", 0.5, 5000.0, step=0.5)
+    hour_of_day  = field('hour_of_day', st.slider, "Hour of Day (0-23)", 0, 23)
+    day_of_week  = field('day_of_week', st.selectbox, "Day of Week", tuple(DOW_MAP))
+    days_since   = field('days_since_last_txn', st.slider, "Days Since Last Transaction",
+                         0.0, 30.0, step=0.1)
+
+    section("🏪 Merchant & Location", 'merchant_category', 'distance_from_home',
+            'is_online', 'is_international', 'card_present')
+    merchant_cat  = field('merchant_category', st.selectbox, "Merchant Category", range(10),
+                          format_func=MERCHANT_CATS.__getitem__)
+    distance      = field('distance_from_home', st.slider, "Distance from Home (km)",
+                          0.0, 1000.0, step=1.0)
+    is_online     = field('is_online', st.checkbox, "Online Transaction")
+    is_intl       = field('is_international', st.checkbox, "International Transaction")
+    card_present  = field('card_present', st.checkbox, "Card Present")
+
+    section("📊 Behavioral Signals", 'num_transactions_1h', 'num_transactions_24h', 'avg_amount_30d')
+    num_txn_1h   = field('num_transactions_1h', st.slider, "Transactions (last 1h)", 0, 20)
+    num_txn_24h  = field('num_transactions_24h', st.slider, "Transactions (last 24h)", 0, 50)
+    avg_amt_30d  = field('avg_amount_30d', st.slider, "Avg Amount (last 30d) $",
+                         1.0, 3000.0, step=1.0)
+
+    section("🔮 Risk Signals", 'credit_limit_used_pct', 'velocity_score', 'geo_risk_score')
+    credit_pct    = field('credit_limit_used_pct', st.slider, "Credit Limit Used %", 0.0, 1.0,
+                          step=0.01, format="%.0f%%", help="0 = 0%, 1 = 100%")
+    velocity_sc   = field('velocity_score', st.slider, "Velocity Score", 0.0, 1.0, step=0.01)
+    geo_risk_sc   = field('geo_risk_score', st.slider, "Geo Risk Score", 0.0, 1.0, step=0.01)
 
     st.markdown("---")
     analyze_btn   = st.button("🔍  ANALYZE TRANSACTION")
@@ -467,14 +463,13 @@ with st.sidebar:
 
 
 # ── Build Feature Vector ───────────────────────────────────────────────────────
-amount_to_avg = amount / (avg_amt_30d + 1)
-txn_burst     = num_txn_1h / (num_txn_24h + 1)
-risk_comp     = (velocity_sc + geo_risk_sc) / 2
+amount_to_avg, txn_burst, risk_comp = derived(amount, avg_amt_30d, num_txn_1h,
+                                              num_txn_24h, velocity_sc, geo_risk_sc)
 
 input_data = {
     'amount':                amount,
     'hour_of_day':           hour_of_day,
-    'day_of_week':           dow_map[day_of_week],
+    'day_of_week':           DOW_MAP[day_of_week],
     'merchant_category':     merchant_cat,
     'num_transactions_1h':   num_txn_1h,
     'num_transactions_24h':  num_txn_24h,
@@ -492,303 +487,264 @@ input_data = {
     'risk_composite':        risk_comp,
 }
 
-input_df  = pd.DataFrame([input_data])[FEATURES]
-input_sc  = scaler.transform(input_df)
-prob      = model.predict_proba(input_sc)[0]
-prob_fraud, prob_safe = float(prob[1]), float(prob[0])
-prediction = int(prob_fraud > 0.5)
-
-# Risk tier
-if prob_fraud < 0.2:   risk_tier, risk_color = "LOW",      "#10b981"
-elif prob_fraud < 0.5: risk_tier, risk_color = "MODERATE", "#f59e0b"
-elif prob_fraud < 0.8: risk_tier, risk_color = "HIGH",     "#ef4444"
-else:                  risk_tier, risk_color = "CRITICAL",  "#dc2626"
-
-
-# ── Top Metrics Row ─────────────────────────────────────────────────────────────
-st.markdown(f"""
-<div class="metric-grid">
-    <div class="metric-tile blue">
-        <span class="metric-icon">💳</span>
-        <div class="metric-label">Transaction Amount</div>
-        <div class="metric-value">${amount:,.2f}</div>
-    </div>
-    <div class="metric-tile {'red' if prediction else 'green'}">
-        <span class="metric-icon">{'🚨' if prediction else '✅'}</span>
-        <div class="metric-label">Model Decision</div>
-        <div class="metric-value">{'FRAUD' if prediction else 'SAFE'}</div>
-    </div>
-    <div class="metric-tile amber">
-        <span class="metric-icon">⚠️</span>
-        <div class="metric-label">Fraud Probability</div>
-        <div class="metric-value">{prob_fraud*100:.1f}%</div>
-    </div>
-    <div class="metric-tile {'red' if risk_tier in ['HIGH','CRITICAL'] else 'green' if risk_tier=='LOW' else 'amber'}">
-        <span class="metric-icon">🎯</span>
-        <div class="metric-label">Risk Tier</div>
-        <div class="metric-value" style="font-size:1.4rem;">{risk_tier}</div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-
-# ── Main Columns ──────────────────────────────────────────────────────────────
-col1, col2 = st.columns([3, 2], gap="large")
-
-with col1:
-    # ── Analysis Result ───────────────────────────────────────────────────────
-    if analyze_btn:
-        with st.spinner("Running inference…"):
-            time.sleep(0.6)
+# ── Run Inference (on ANALYZE only) ────────────────────────────────────────────
+if analyze_btn:
+    with st.spinner("Running inference…"):
+        prob_safe, prob_fraud = score(**input_data)
+    st.session_state['last_result'] = {
+        'prob_fraud': prob_fraud,
+        'prob_safe':  prob_safe,
+        'input_data': input_data,
+    }
 
-    if prediction == 0:
-        st.markdown(f"""
-        <div class="result-safe">
-            <div class="result-emoji">✅</div>
-            <div class="result-title safe">TRANSACTION APPROVED</div>
-            <div class="result-meta">
-                This transaction appears <strong>legitimate</strong>. 
-                Fraud probability is only <strong>{prob_fraud*100:.2f}%</strong> — 
-                well below the 50% decision threshold.
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="result-fraud">
-            <div class="result-emoji">🚨</div>
-            <div class="result-title fraud">FRAUD ALERT — TRANSACTION BLOCKED</div>
-            <div class="result-meta">
-                This transaction has been flagged as <strong>potentially fraudulent</strong>. 
-                Fraud probability: <strong>{prob_fraud*100:.2f}%</strong>. 
-                Immediate review recommended.
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
 
-    # ── Probability Bars ───────────────────────────────────────────────────────
-    st.markdown("""<div class="section-label">Confidence Breakdown</div>""", unsafe_allow_html=True)
+# ── Result Panels ──────────────────────────────────────────────────────────────
+def render_result(result):
+    """Render the metrics row and detail columns for a stored analysis result."""
+    input_data    = result['input_data']
+    prob_fraud    = result['prob_fraud']
+    prob_safe     = result['prob_safe']
+    amount        = input_data['amount']
+    hour_of_day   = input_data['hour_of_day']
+    num_txn_1h    = input_data['num_transactions_1h']
+    avg_amt_30d   = input_data['avg_amount_30d']
+    distance      = input_data['distance_from_home']
+    is_intl       = input_data['is_international']
+    credit_pct    = input_data['credit_limit_used_pct']
+    velocity_sc   = input_data['velocity_score']
+    geo_risk_sc   = input_data['geo_risk_score']
+    amount_to_avg = input_data['amount_to_avg_ratio']
+    txn_burst     = input_data['txn_burst']
+    risk_comp     = input_data['risk_composite']
+
+    prediction = int(prob_fraud > 0.5)
+
+    # Risk tier — side='right' keeps each edge in the tier above it (0.2 → MODERATE)
+    tier_idx   = int(np.searchsorted(RISK_EDGES, prob_fraud, side='right'))
+    risk_tier  = RISK_TIERS[tier_idx]
+    risk_color = RISK_COLORS[tier_idx]
+    tier_tile  = RISK_TILES[tier_idx]
+
+    # ── Top Metrics Row ─────────────────────────────────────────────────────────
     st.markdown(f"""
-    <div class="glass-card">
-        <div class="prob-container">
-            <div class="prob-label">
-                <span>✅ Legitimate</span><span>{prob_safe*100:.1f}%</span>
-            </div>
-            <div class="prob-track">
-                <div class="prob-fill safe" style="width:{prob_safe*100:.1f}%;"></div>
-            </div>
+    <div class="metric-grid">
+        <div class="metric-tile blue">
+            <span class="metric-icon">💳</span>
+            <div class="metric-label">Transaction Amount</div>
+            <div class="metric-value">{f"${amount:,.2f}" if 'amount' in SHOWN else "—"}</div>
         </div>
-        <div class="prob-container" style="margin-top:1rem;">
-            <div class="prob-label">
-                <span>🚨 Fraudulent</span><span>{prob_fraud*100:.1f}%</span>
-            </div>
-            <div class="prob-track">
-                <div class="prob-fill fraud" style="width:{prob_fraud*100:.1f}%;"></div>
-            </div>
+        <div class="metric-tile {'red' if prediction else 'green'}">
+            <span class="metric-icon">{'🚨' if prediction else '✅'}</span>
+            <div class="metric-label">Model Decision</div>
+            <div class="metric-value">{'FRAUD' if prediction else 'SAFE'}</div>
         </div>
-        <div style="margin-top:1.2rem; padding-top:1rem; border-top:1px solid var(--border);
-             font-family:'Space Mono',monospace; font-size:0.7rem; color:var(--text-muted);">
-            ⓘ Decision threshold: 50% — Model confidence: {max(prob_fraud,prob_safe)*100:.1f}%
+        <div class="metric-tile amber">
+            <span class="metric-icon">⚠️</span>
+            <div class="metric-label">Fraud Probability</div>
+            <div class="metric-value">{prob_fraud*100:.1f}%</div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # ── Risk Factors Table ─────────────────────────────────────────────────────
-    st.markdown("""<div class="section-label" style="margin-top:1rem;">Risk Factor Analysis</div>""", unsafe_allow_html=True)
-
-    flags = []
-    if prob_fraud > 0.5:
-        if amount > avg_amt_30d * 2:      flags.append(("HIGH", "Amount is 2× above 30-day average", "💰"))
-        if hour_of_day < 6:               flags.append(("MED",  "Transaction at unusual hour (midnight-6AM)", "🌙"))
-        if is_intl:                       flags.append(("MED",  "International transaction detected", "🌍"))
-        if distance > 200:                flags.append(("HIGH", f"Far from home: {distance:.0f} km", "📍"))
-        if num_txn_1h > 5:                flags.append(("HIGH", f"Velocity burst: {num_txn_1h} txns in 1h", "⚡"))
-        if velocity_sc > 0.7:             flags.append(("HIGH", f"High velocity score: {velocity_sc:.2f}", "🚀"))
-        if geo_risk_sc > 0.7:             flags.append(("HIGH", f"High geo risk: {geo_risk_sc:.2f}", "🗺️"))
-        if credit_pct > 0.85:             flags.append(("MED",  f"Near credit limit: {credit_pct*100:.0f}% used", "💳"))
-    else:
-        flags.append(("LOW", "No significant fraud indicators detected", "✅"))
-
-    rows = ""
-    for level, msg, icon in flags:
-        color = {"HIGH":"#ef4444","MED":"#f59e0b","LOW":"#10b981"}[level]
-        rows += f"""
-        <div style="display:flex; align-items:center; gap:0.8rem; padding:0.7rem 0;
-             border-bottom:1px solid var(--border);">
-            <span style="font-size:1.2rem;">{icon}</span>
-            <span style="background:{color}22; color:{color}; font-family:'Space Mono',monospace;
-                  font-size:0.6rem; padding:0.2rem 0.5rem; border-radius:4px;
-                  border:1px solid {color}55; min-width:36px; text-align:center;">{level}</span>
-            <span style="font-size:0.85rem; color:var(--text-primary);">{msg}</span>
-        </div>"""
-
-    st.markdown(f'<div class="glass-card">{rows}</div>', unsafe_allow_html=True)
-
-    # ── Transaction JSON ───────────────────────────────────────────────────────
-    with st.expander("📄 Raw Transaction Payload (JSON)"):
-        payload = dict(input_data)
-        payload['__meta__'] = {
-            'fraud_probability': round(prob_fraud, 6),
-            'safe_probability':  round(prob_safe, 6),
-            'model_decision':    'FRAUD' if prediction else 'LEGITIMATE',
-            'risk_tier':         risk_tier,
-        }
-        st.json(payload)
-
-
-with col2:
-    # ── Risk Gauge SVG ────────────────────────────────────────────────────────
-    st.markdown("""<div class="section-label">Risk Gauge</div>""", unsafe_allow_html=True)
-
-    angle    = prob_fraud * 180  # 0 = safe, 180 = fraud
-    rad      = (180 - angle) * (3.14159 / 180)
-    nx       = 90 + 70 * (0 if rad == 0 else (1 if rad < 1.57 else -1))
-    # Simple needle calculation
-    import math
-    rad_val  = (1 - prob_fraud) * math.pi   # pi=safe, 0=fraud
-    nx       = 90 + 70 * math.cos(rad_val)
-    ny       = 85 - 70 * math.sin(rad_val)
-
-    gauge_color = risk_color
-    st.markdown(f"""
-    <div class="glass-card" style="text-align:center; padding:2rem 1.5rem;">
-        <svg viewBox="0 0 180 100" width="100%" style="max-width:260px; margin:0 auto; display:block;">
-            <!-- Background arcs -->
-            <path d="M 10 85 A 80 80 0 0 1 90 5" stroke="#10b98133" stroke-width="14" fill="none" stroke-linecap="round"/>
-            <path d="M 90 5 A 80 80 0 0 1 140 25" stroke="#f59e0b33" stroke-width="14" fill="none" stroke-linecap="round"/>
-            <path d="M 140 25 A 80 80 0 0 1 170 85" stroke="#ef444433" stroke-width="14" fill="none" stroke-linecap="round"/>
-            <!-- Active arc -->
-            <path d="M 10 85 A 80 80 0 0 1 {nx:.1f} {ny:.1f}" stroke="{gauge_color}" stroke-width="14" fill="none" stroke-linecap="round" opacity="0.85"/>
-            <!-- Needle -->
-            <line x1="90" y1="85" x2="{nx:.1f}" y2="{ny:.1f}" stroke="white" stroke-width="2.5" stroke-linecap="round"/>
-            <circle cx="90" cy="85" r="5" fill="white"/>
-            <!-- Labels -->
-            <text x="10"  y="98" font-size="7" fill="#10b981" font-family="monospace">SAFE</text>
-            <text x="150" y="98" font-size="7" fill="#ef4444" font-family="monospace">FRAUD</text>
-            <text x="90"  y="62" text-anchor="middle" font-size="14" fill="white" font-family="monospace" font-weight="bold">{prob_fraud*100:.1f}%</text>
-            <text x="90"  y="74" text-anchor="middle" font-size="7" fill="#6b7c93" font-family="monospace">FRAUD PROBABILITY</text>
-        </svg>
-        <div style="font-family:'Space Mono',monospace; font-size:1.1rem; font-weight:700;
-             color:{gauge_color}; margin-top:0.5rem;">{risk_tier} RISK</div>
-        <div style="font-family:'Space Mono',monospace; font-size:0.65rem; color:var(--text-muted); margin-top:0.25rem;">
-            Decision Threshold: 50.00%
+        <div class="metric-tile {tier_tile}">
+            <span class="metric-icon">🎯</span>
+            <div class="metric-label">Risk Tier</div>
+            <div class="metric-value" style="font-size:1.4rem;">{risk_tier}</div>
         </div>
     </div>
     """, unsafe_allow_html=True)
 
-    # ── Feature Importance ─────────────────────────────────────────────────────
-    st.markdown("""<div class="section-label" style="margin-top:1rem;">Model Feature Importance</div>""", unsafe_allow_html=True)
-
-    fi = pd.Series(model.feature_importances_, index=FEATURES).sort_values(ascending=False)
-    max_fi = fi.max()
-
-    fi_html = '<div class="glass-card">'
-    label_map = {
-        'risk_composite':'Risk Composite','geo_risk_score':'Geo Risk Score',
-        'velocity_score':'Velocity Score','credit_limit_used_pct':'Credit Limit Used',
-        'num_transactions_24h':'Txns 24h','hour_of_day':'Hour of Day',
-        'distance_from_home':'Distance Home','num_transactions_1h':'Txns 1h',
-        'amount_to_avg_ratio':'Amt/Avg Ratio','amount':'Amount',
-        'is_international':'Is International','avg_amount_30d':'Avg Amt 30d',
-        'days_since_last_txn':'Days Since Txn','txn_burst':'Txn Burst',
-        'day_of_week':'Day of Week','is_online':'Is Online',
-        'card_present':'Card Present','merchant_category':'Merchant Cat',
-    }
-    for feat, val in fi.head(10).items():
-        pct  = val / max_fi * 100
-        name = label_map.get(feat, feat)
-        fi_html += f"""
-        <div class="fi-row">
-            <div class="fi-name">{name}</div>
-            <div class="fi-track">
-                <div class="fi-fill" style="width:{pct:.1f}%;"></div>
+    # ── Main Columns ──────────────────────────────────────────────────────────
+    col1, col2 = st.columns([3, 2], gap="large")
+
+    with col1:
+        # ── Analysis Result ───────────────────────────────────────────────────
+        if prediction == 0:
+            st.markdown(f"""
+            <div class="result-safe">
+                <div class="result-emoji">✅</div>
+                <div class="result-title safe">TRANSACTION APPROVED</div>
+                <div class="result-meta">
+                    This transaction appears <strong>legitimate</strong>. 
+                    Fraud probability is only <strong>{prob_fraud*100:.2f}%</strong> — 
+                    well below the 50% decision threshold.
+                </div>
             </div>
-            <div class="fi-val">{val:.3f}</div>
-        </div>"""
-    fi_html += '</div>'
-    st.markdown(fi_html, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="result-fraud">
+                <div class="result-emoji">🚨</div>
+                <div class="result-title fraud">FRAUD ALERT — TRANSACTION BLOCKED</div>
+                <div class="result-meta">
+                    This transaction has been flagged as <strong>potentially fraudulent</strong>. 
+                    Fraud probability: <strong>{prob_fraud*100:.2f}%</strong>. 
+                    Immediate review recommended.
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
 
-    # ── Derived Signals ────────────────────────────────────────────────────────
-    st.markdown("""<div class="section-label" style="margin-top:1rem;">Derived Signals</div>""", unsafe_allow_html=True)
-    st.markdown(f"""
-    <div class="glass-card">
-        <div style="display:grid; grid-template-columns:1fr 1fr; gap:0.8rem;">
-            <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
-                 border-radius:8px; border:1px solid var(--border);">
-                <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
-                     letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Amt/Avg Ratio</div>
-                <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
-                     font-weight:700; color:{'#ef4444' if amount_to_avg > 3 else '#10b981'}; margin-top:0.25rem;">
-                     {amount_to_avg:.2f}x</div>
+        # ── Probability Bars ───────────────────────────────────────────────────
+        st.markdown("""<div class="section-label">Confidence Breakdown</div>""", unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="glass-card">
+            <div class="prob-container">
+                <div class="prob-label">
+                    <span>✅ Legitimate</span><span>{prob_safe*100:.1f}%</span>
+                </div>
+                <div class="prob-track">
+                    <div class="prob-fill safe" style="width:{prob_safe*100:.1f}%;"></div>
+                </div>
             </div>
-            <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
-                 border-radius:8px; border:1px solid var(--border);">
-                <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
-                     letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Txn Burst</div>
-                <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
-                     font-weight:700; color:{'#ef4444' if txn_burst > 0.5 else '#10b981'}; margin-top:0.25rem;">
-                     {txn_burst:.2f}</div>
+            <div class="prob-container" style="margin-top:1rem;">
+                <div class="prob-label">
+                    <span>🚨 Fraudulent</span><span>{prob_fraud*100:.1f}%</span>
+                </div>
+                <div class="prob-track">
+                    <div class="prob-fill fraud" style="width:{prob_fraud*100:.1f}%;"></div>
+                </div>
             </div>
-            <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
-                 border-radius:8px; border:1px solid var(--border);">
-                <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
-                     letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Risk Composite</div>
-                <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
-                     font-weight:700; color:{'#ef4444' if risk_comp > 0.5 else '#10b981'}; margin-top:0.25rem;">
-                     {risk_comp:.3f}</div>
+            <div style="margin-top:1.2rem; padding-top:1rem; border-top:1px solid var(--border);
+                 font-family:'Space Mono',monospace; font-size:0.7rem; color:var(--text-muted);">
+                ⓘ Decision threshold: 50% — Model confidence: {max(prob_fraud,prob_safe)*100:.1f}%
             </div>
-            <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
-                 border-radius:8px; border:1px solid var(--border);">
-                <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
-                     letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Scenario</div>
-                <div style="font-family:'Space Mono',monospace; font-size:0.8rem;
-                     font-weight:700; color:{'#ef4444' if prediction else '#10b981'}; margin-top:0.25rem;">
-                     {'⚠️ SUSPICIOUS' if prediction else '✅ NORMAL'}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # ── Risk Factors Table ─────────────────────────────────────────────────
+        st.markdown("""<div class="section-label" style="margin-top:1rem;">Risk Factor Analysis</div>""", unsafe_allow_html=True)
+
+        if prob_fraud > 0.5:
+            values = np.array([amount / avg_amt_30d, hour_of_day, is_intl, distance,
+                               num_txn_1h, velocity_sc, geo_risk_sc, credit_pct], dtype=np.float64)
+            fired  = np.flatnonzero(((values - RISK_THRESHOLDS) * RISK_SIGNS > 0) &
+                                    [SHOWN.issuperset(inputs) for inputs in RISK_INPUTS])
+            fmt    = dict(distance=distance, num_txn_1h=num_txn_1h, velocity_sc=velocity_sc,
+                          geo_risk_sc=geo_risk_sc, credit_pct=credit_pct)
+            flags  = [(RISK_RULES[i][0], RISK_RULES[i][1].format(**fmt), RISK_RULES[i][2]) for i in fired]
+        else:
+            flags = [("LOW", "No significant fraud indicators detected", "✅")]
+
+        rows = ""
+        for level, msg, icon in flags:
+            color = {"HIGH":"#ef4444","MED":"#f59e0b","LOW":"#10b981"}[level]
+            rows += f"""
+            <div style="display:flex; align-items:center; gap:0.8rem; padding:0.7rem 0;
+                 border-bottom:1px solid var(--border);">
+                <span style="font-size:1.2rem;">{icon}</span>
+                <span style="background:{color}22; color:{color}; font-family:'Space Mono',monospace;
+                      font-size:0.6rem; padding:0.2rem 0.5rem; border-radius:4px;
+                      border:1px solid {color}55; min-width:36px; text-align:center;">{level}</span>
+                <span style="font-size:0.85rem; color:var(--text-primary);">{msg}</span>
+            </div>"""
+
+        st.markdown(f'<div class="glass-card">{rows}</div>', unsafe_allow_html=True)
+
+        # ── Transaction JSON ───────────────────────────────────────────────────
+        with st.expander("📄 Raw Transaction Payload (JSON)"):
+            # Only what the user entered and the model read — not defaults of hidden inputs
+            payload = {k: v for k, v in input_data.items() if k in SHOWN or k in FEATURE_IDX}
+            payload['__meta__'] = {
+                'fraud_probability': round(prob_fraud, 6),
+                'safe_probability':  round(prob_safe, 6),
+                'model_decision':    'FRAUD' if prediction else 'LEGITIMATE',
+                'risk_tier':         risk_tier,
+            }
+            st.json(payload)
+
+    with col2:
+        # ── Risk Gauge SVG ────────────────────────────────────────────────────
+        st.markdown("""<div class="section-label">Risk Gauge</div>""", unsafe_allow_html=True)
+
+        # Needle geometry is precomputed per 1% bucket; colour and labels are exact
+        gauge_html = gauge_templates()[round(prob_fraud * 100)]
+        st.markdown(gauge_html.format(color=risk_color, pct=f"{prob_fraud*100:.1f}",
+                                      tier=risk_tier), unsafe_allow_html=True)
+
+        # ── Feature Importance ─────────────────────────────────────────────────
+        st.markdown("""<div class="section-label" style="margin-top:1rem;">Model Feature Importance</div>""", unsafe_allow_html=True)
+
+        fi_html = feature_importance_html(id(model), tuple(model.feature_importances_),
+                                          tuple(FEATURES), tuple(LABEL_MAP.items()))
+        st.markdown(fi_html, unsafe_allow_html=True)
+
+        # ── Derived Signals ────────────────────────────────────────────────────
+        st.markdown("""<div class="section-label" style="margin-top:1rem;">Derived Signals</div>""", unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="glass-card">
+            <div style="display:grid; grid-template-columns:1fr 1fr; gap:0.8rem;">
+                <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
+                     border-radius:8px; border:1px solid var(--border);">
+                    <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
+                         letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Amt/Avg Ratio</div>
+                    <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
+                         font-weight:700; color:{'#ef4444' if amount_to_avg > 3 else '#10b981'}; margin-top:0.25rem;">
+                         {f"{amount_to_avg:.2f}x" if SHOWN.issuperset(DERIVED_INPUTS['amount_to_avg_ratio']) else "—"}</div>
+                </div>
+                <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
+                     border-radius:8px; border:1px solid var(--border);">
+                    <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
+                         letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Txn Burst</div>
+                    <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
+                         font-weight:700; color:{'#ef4444' if txn_burst > 0.5 else '#10b981'}; margin-top:0.25rem;">
+                         {f"{txn_burst:.2f}" if SHOWN.issuperset(DERIVED_INPUTS['txn_burst']) else "—"}</div>
+                </div>
+                <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
+                     border-radius:8px; border:1px solid var(--border);">
+                    <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
+                         letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Risk Composite</div>
+                    <div style="font-family:'Space Mono',monospace; font-size:1.3rem;
+                         font-weight:700; color:{'#ef4444' if risk_comp > 0.5 else '#10b981'}; margin-top:0.25rem;">
+                         {f"{risk_comp:.3f}" if SHOWN.issuperset(DERIVED_INPUTS['risk_composite']) else "—"}</div>
+                </div>
+                <div style="text-align:center; padding:0.8rem; background:rgba(255,255,255,0.03);
+                     border-radius:8px; border:1px solid var(--border);">
+                    <div style="font-family:'Space Mono',monospace; font-size:0.6rem;
+                         letter-spacing:1px; color:var(--text-muted); text-transform:uppercase;">Scenario</div>
+                    <div style="font-family:'Space Mono',monospace; font-size:0.8rem;
+                         font-weight:700; color:{'#ef4444' if prediction else '#10b981'}; margin-top:0.25rem;">
+                         {'⚠️ SUSPICIOUS' if prediction else '✅ NORMAL'}</div>
+                </div>
             </div>
         </div>
+        """, unsafe_allow_html=True)
+
+
+# Only the last *analyzed* transaction is shown; slider moves alone don't re-score
+last_result = st.session_state.get('last_result')
+if last_result is None:
+    st.markdown("""
+    <div class="glass-card" style="text-align:center; padding:2.5rem 1.5rem;">
+        <div style="font-size:2rem; margin-bottom:0.5rem;">🔍</div>
+        <div style="font-family:'Space Mono',monospace; font-size:0.9rem; font-weight:700;
+             color:var(--text-primary);">NO TRANSACTION ANALYZED YET</div>
+        <div style="font-size:0.8rem; color:var(--text-muted); margin-top:0.4rem;">
+            Set the transaction parameters in the sidebar and click ANALYZE TRANSACTION.
+        </div>
     </div>
     """, unsafe_allow_html=True)
+else:
+    render_result(last_result)
 
 
 # ── Preset Scenarios ───────────────────────────────────────────────────────────
 st.markdown("---")
 st.markdown("""<div class="section-label">Quick Test Scenarios</div>""", unsafe_allow_html=True)
 
-scenario_cols = st.columns(4)
-scenarios = [
-    ("🛒 Normal Purchase", "Small, local, daytime transaction", "#10b981"),
-    ("✈️ Travel Transaction", "International, moderate amount", "#f59e0b"),
-    ("🚨 Card Stolen", "High amount, late night, international", "#ef4444"),
-    ("💻 Online Fraud", "Velocity burst + near credit limit", "#dc2626"),
-]
-for i, (title, desc, color) in enumerate(scenarios):
-    with scenario_cols[i]:
-        st.markdown(f"""
-        <div style="background:var(--bg-card); border:1px solid var(--border);
-             border-top:2px solid {color}; border-radius:var(--radius);
-             padding:1rem; text-align:center; cursor:pointer;
-             transition: all 0.2s ease;">
-            <div style="font-size:1.5rem; margin-bottom:0.4rem;">{title.split()[0]}</div>
-            <div style="font-family:'Space Mono',monospace; font-size:0.75rem;
-                 font-weight:700; color:{color}; margin-bottom:0.3rem;">
-                 {' '.join(title.split()[1:])}</div>
-            <div style="font-size:0.75rem; color:var(--text-muted);">{desc}</div>
-        </div>
-        """, unsafe_allow_html=True)
+for col, card in zip(st.columns(len(SCENARIOS)), scenario_cards_html(id(model))):
+    with col:
+        st.markdown(card, unsafe_allow_html=True)
 
 st.markdown("""
 <div style="text-align:center; margin-top:1.5rem; font-family:'Space Mono',monospace;
      font-size:0.7rem; color:#3d4f61; letter-spacing:1px;">
-    💡 Use the sidebar sliders to replicate these scenarios and see the model react in real-time
+    💡 Use the sidebar sliders to replicate these scenarios, then click ANALYZE to score them
 </div>
 """, unsafe_allow_html=True)
 
 # ── Footer ─────────────────────────────────────────────────────────────────────
-st.markdown("""
+st.markdown(f"""
 <div style="margin-top:3rem; padding:1.5rem; border-top:1px solid var(--border);
      text-align:center; font-family:'Space Mono',monospace; font-size:0.65rem;
      color:#3d4f61; letter-spacing:1px;">
-    FraudShield AI • Random Forest Classifier • 18 Engineered Features • 50,000 Training Samples<br>
+    FraudShield AI • Tree Ensemble Classifier • {len(FEATURES)} Model Features • 50,000 Training Samples<br>
     <span style="color:#1e2d3d;">Built with Streamlit + scikit-learn + joblib</span>
 </div>
 """, unsafe_allow_html=True)
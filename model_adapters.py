@@ -0,0 +1,239 @@
+"""
+Credit Card Fraud Detection — Serving Adapters
+Alternative runtimes for the trained model, each exposing the small slice of the
+scikit-learn API that app.py uses: predict_proba(X) and feature_importances_.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def forest_arrays(model):
+    """Stack a fitted RandomForestClassifier's trees into padded 2-D node arrays.
+
+    Rows are trees and columns are node ids; padding nodes are leaves. Thresholds
+    are rounded *down* to float32 so that for float32 inputs
+    ``x <= thr32`` exactly matches sklearn's ``x <= thr64``.
+    """
+    trees     = [est.tree_ for est in model.estimators_]
+    n_trees   = len(trees)
+    max_nodes = max(t.node_count for t in trees)
+    fraud_col = list(model.classes_).index(1)
+
+    feature        = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+    threshold      = np.zeros((n_trees, max_nodes), dtype=np.float32)
+    children_left  = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+    children_right = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+    value          = np.zeros((n_trees, max_nodes), dtype=np.float32)
+
+    for i, t in enumerate(trees):
+        n = t.node_count
+        feature[i, :n]        = np.where(t.feature >= 0, t.feature, -1)
+        thr32                 = t.threshold.astype(np.float32)
+        threshold[i, :n]      = np.where(thr32 > t.threshold,
+                                         np.nextafter(thr32, np.float32(-np.inf)), thr32)
+        children_left[i, :n]  = t.children_left
+        children_right[i, :n] = t.children_right
+        counts = t.value[:, 0, :]
+        value[i, :n] = counts[:, fraud_col] / counts.sum(axis=1)
+
+    return {
+        'feature':        feature,
+        'threshold':      threshold,
+        'children_left':  children_left,
+        'children_right': children_right,
+        'value':          value,
+        'max_depth':      max(t.max_depth for t in trees),
+    }
+
+
+class OnnxModel:
+    """ONNX Runtime session for the exported model (see train_model.py)."""
+
+    def __init__(self, path, feature_importances):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = 1   # batch_size=1 — thread launch costs more than it saves
+        self.sess = ort.InferenceSession(path, sess_options=opts,
+                                         providers=["CPUExecutionProvider"])
+        self.input_name = self.sess.get_inputs()[0].name
+        # ONNX drops fitted attributes, so importances come from a sidecar artifact
+        self.feature_importances_ = np.asarray(feature_importances)
+
+    def predict_proba(self, X):
+        # Outputs are (label, probabilities); exported with zipmap=False
+        return self.sess.run(None, {self.input_name: np.asarray(X, dtype=np.float32)})[1]
+
+
+class LightGBMModel:
+    """LightGBM booster loaded from its native text dump (no pickle)."""
+
+    def __init__(self, path):
+        import lightgbm as lgb
+
+        self.booster = lgb.Booster(model_file=path)
+        gain = self.booster.feature_importance(importance_type="gain")
+        self.feature_importances_ = gain / gain.sum()   # sklearn-style, sums to 1
+
+    def predict_proba(self, X):
+        p_fraud = self.booster.predict(np.asarray(X, dtype=np.float32), num_threads=1)
+        return np.column_stack([1.0 - p_fraud, p_fraud])
+
+
+class TreeliteModel:
+    """Shared library compiled from the model by Treelite + tl2cgen (see train_model.py).
+
+    Every tree is emitted as a straight if/else cascade in C, so scoring a row is
+    one native call with no per-node interpreter work.
+    """
+
+    def __init__(self, path, feature_importances):
+        import tl2cgen
+
+        self._dmatrix = tl2cgen.DMatrix
+        try:
+            self.predictor = tl2cgen.Predictor(path, nthread=1)   # batch_size=1 — stay on this thread
+        except tl2cgen.TL2cgenError as exc:
+            # e.g. built for another platform/runtime — report it as a load failure
+            raise OSError(f"cannot load {path}: {exc}") from exc
+        # The compiled library keeps no fitted attributes, so importances come from a sidecar
+        self.feature_importances_ = np.asarray(feature_importances)
+
+    def predict_proba(self, X):
+        # Output is (n_rows, n_targets=1, n_classes=1) holding P(fraud)
+        out = self.predictor.predict(self._dmatrix(np.asarray(X, dtype=np.float32)))
+        p_fraud = out.reshape(len(out)).astype(np.float64)
+        return np.column_stack([1.0 - p_fraud, p_fraud])
+
+
+def lgb_gain_importances(path):
+    """Normalised total split gain per feature, read straight from a LightGBM text
+    dump — what Booster.feature_importance("gain") reports, without lightgbm."""
+    gain = feats = None
+    with open(path) as f:
+        for line in f:
+            key, _, val = line.partition("=")
+            if key == "max_feature_idx":
+                gain = np.zeros(int(val) + 1)
+            elif key == "split_feature":
+                feats = np.array(val.split(), dtype=np.intp)
+            elif key == "split_gain":
+                np.add.at(gain, feats, np.array(val.split(), dtype=np.float64))
+    return gain / gain.sum()
+
+
+class LleavesModel:
+    """LightGBM text dump JIT-compiled to native code by lleaves (LLVM).
+
+    The compiled object is cached next to the model file; a cache older than the
+    model is discarded so a retrain is never served by stale code.
+    """
+
+    def __init__(self, path, cache):
+        import lleaves
+        import llvmlite.binding
+
+        # lleaves drives LLVM's legacy pass manager, which newer llvmlite removed
+        if not hasattr(llvmlite.binding, "PassManagerBuilder"):
+            raise ImportError("lleaves needs an llvmlite with PassManagerBuilder (< 0.45)")
+        if os.path.exists(cache) and os.path.getmtime(cache) < os.path.getmtime(path):
+            os.remove(cache)
+        self.model = lleaves.Model(model_file=path)
+        self.model.compile(cache=cache)
+        self.feature_importances_ = lgb_gain_importances(path)
+
+    def predict_proba(self, X):
+        # lleaves computes in float64; n_jobs=1 — batch_size=1, no thread fan-out
+        p_fraud = self.model.predict(np.asarray(X, dtype=np.float64), n_jobs=1)
+        return np.column_stack([1.0 - p_fraud, p_fraud])
+
+
+class QuantizedForest:
+    """Random Forest with 8-bit binned thresholds (see quantize_forest.py).
+
+    Each feature keeps a sorted table of at most 255 bin edges. Inputs are
+    binned once per row, then every tree is walked in lockstep on the uint8
+    bins. Node arrays are padded to (n_trees, max_nodes) so one NumPy gather
+    advances all trees by one level.
+    """
+
+    def __init__(self, edges, feature, threshold, children_left, children_right,
+                 value, max_depth, feature_importances):
+        self.edges          = np.asarray(edges, dtype=np.float32)   # (n_features, max_edges), +inf padded
+        self.feature        = feature          # (n_trees, max_nodes) int8, -1 at leaves
+        self.threshold      = threshold        # (n_trees, max_nodes) uint8 bin index
+        self.children_left  = children_left    # (n_trees, max_nodes) int32
+        self.children_right = children_right   # (n_trees, max_nodes) int32
+        self.value          = value            # (n_trees, max_nodes) float32 P(fraud)
+        self.max_depth      = int(max_depth)
+        self.feature_importances_ = np.asarray(feature_importances)
+        self._trees = np.arange(feature.shape[0])
+
+    def _bin(self, X):
+        # bin(x) = #edges strictly below x, so  x <= edge[k]  <=>  bin(x) <= k
+        return (X[:, :, None] > self.edges[None, :, :]).sum(axis=2)
+
+    def predict_proba(self, X):
+        # Edges come from float32 split points, so float32 binning is exact
+        X     = np.asarray(X, dtype=np.float32)
+        bins  = self._bin(X)
+        trees = self._trees
+        p_fraud = np.empty(len(X))
+        for i, row in enumerate(bins):
+            node = np.zeros(len(trees), dtype=np.intp)
+            for _ in range(self.max_depth):
+                feat    = self.feature[trees, node]
+                go_left = row[feat] <= self.threshold[trees, node]
+                child   = np.where(go_left, self.children_left[trees, node],
+                                   self.children_right[trees, node])
+                node    = np.where(feat < 0, node, child)
+            p_fraud[i] = self.value[trees, node].mean()
+        return np.column_stack([1.0 - p_fraud, p_fraud])
+
+
+if NUMBA_AVAILABLE:
+    # Serial on purpose: Streamlit calls in from per-session threads, and Numba's
+    # default workqueue layer is neither re-entrant across threads nor clean at
+    # interpreter exit when launched off the main thread
+    @njit(cache=True)
+    def _walk_trees(x, feature, threshold, children_left, children_right, value):
+        """Mean leaf P(fraud) over all trees, reduced in the kernel (no shared buffer)."""
+        total = 0.0
+        for t in range(feature.shape[0]):
+            node = 0
+            while children_left[t, node] != -1:
+                if x[feature[t, node]] <= threshold[t, node]:
+                    node = children_left[t, node]
+                else:
+                    node = children_right[t, node]
+            total += value[t, node]
+        return total / feature.shape[0]
+
+
+class NumbaForest:
+    """Random Forest walked by a compiled Numba kernel over forest_arrays()."""
+
+    def __init__(self, model):
+        arrays = forest_arrays(model)
+        self.feature        = arrays['feature']
+        self.threshold      = arrays['threshold']
+        self.children_left  = arrays['children_left']
+        self.children_right = arrays['children_right']
+        self.value          = arrays['value']
+        self.feature_importances_ = model.feature_importances_
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        p_fraud = np.empty(len(X))
+        for i, row in enumerate(X):
+            p_fraud[i] = _walk_trees(row, self.feature, self.threshold, self.children_left,
+                                     self.children_right, self.value)
+        return np.column_stack([1.0 - p_fraud, p_fraud])